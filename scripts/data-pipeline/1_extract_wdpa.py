@@ -13,9 +13,35 @@ Usage:
 
 import csv
 import json
+import mmap
+import operator
+import os
+import re
+import sys
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process, utils
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # Optional speedup; the csv module is used otherwise
+    pacsv = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional speedup; the token index covers both directions
+    ahocorasick = None
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -23,72 +49,333 @@ DATA_DIR = PROJECT_ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 
+# Designation marker for World Heritage Sites (DESIG_ENG column)
+WH_MARKER = 'World Heritage'
+WH_MARKER_BYTES = WH_MARKER.encode('utf-8')
+
+# Files smaller than this are scanned as a single range
+CHUNKED_SCAN_MIN_BYTES = 16 * 1024 * 1024
+
+# Larger files are scanned as this many ranges, reporting progress after each
+SCAN_CHUNKS = 8
+
+# Block size for counting lines within a scanned range
+SCAN_COUNT_BLOCK_BYTES = 4 * 1024 * 1024
+
+# WDPA columns used to build components (the CSV has ~30 columns in total)
+WDPA_COLUMNS = [
+    'WDPAID', 'WDPA_PID', 'NAME', 'ORIG_NAME', 'DESIG_ENG', 'IUCN_CAT',
+    'STATUS', 'STATUS_YR', 'REP_AREA', 'ISO3', 'MARINE',
+]
+
+# Name tokens for substring matching: runs of letters and digits, the same
+# characters _is_word_bounded treats as part of a word
+WORD_TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Minimum RapidFuzz token-set score (0-100) to accept a WDPA -> UNESCO name match
+FUZZY_SCORE_CUTOFF = 80
+
 # Ensure directories exist
 PROCESSED_DIR.mkdir(exist_ok=True)
 
 
-def extract_whs_components(csv_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+def _split_byte_ranges(
+    mm: mmap.mmap,
+    start: int,
+    n_chunks: int
+) -> List[Tuple[int, int]]:
+    """Split mm[start:] into ~n_chunks byte ranges, each ending on a newline"""
+    size = len(mm)
+    step = max((size - start) // n_chunks, 1)
+    ranges = []
+
+    while start < size:
+        end = mm.find(b'\n', min(start + step, size) - 1)
+        end = size if end == -1 else end + 1
+        ranges.append((start, end))
+        start = end
+
+    return ranges
+
+
+def _scan_byte_range(
+    mm: mmap.mmap,
+    start: int,
+    end: int
+) -> Tuple[List[bytes], int]:
+    """
+    Scan one newline-aligned byte range of the CSV for World Heritage lines
+
+    Only ~0.1% of WDPA rows are World Heritage Sites, so rather than visiting
+    every line, mmap.find jumps straight from one marker hit to the next:
+    rejected rows cost no Python work at all.
+
+    Returns:
+        (matching lines, line count)
+    """
+    lines = []
+    marker = WH_MARKER_BYTES
+    find = mm.find
+    pos = find(marker, start, end)
+
+    while pos != -1:
+        line_start = max(mm.rfind(b'\n', start, pos) + 1, start)
+        line_end = find(b'\n', pos, end)
+        line_end = end if line_end == -1 else line_end + 1
+
+        lines.append(mm[line_start:line_end])
+        pos = find(marker, line_end, end)
+
+    # Count lines in bounded blocks (a C-level scan, without copying the
+    # whole range at once); a final line may lack its trailing newline
+    total_rows = sum(
+        mm[block:min(block + SCAN_COUNT_BLOCK_BYTES, end)].count(b'\n')
+        for block in range(start, end, SCAN_COUNT_BLOCK_BYTES)
+    )
+    if end > start and mm[end - 1] != ord('\n'):
+        total_rows += 1
+
+    return lines, total_rows
+
+
+def _scan_whs_lines(csv_path: Path) -> Tuple[bytes, List[bytes], int]:
+    """
+    Scan the raw CSV bytes for lines mentioning World Heritage
+
+    The file is memory-mapped and scanned in-process. The scan is a handful
+    of C-level find calls per range, so worker processes would cost more to
+    start than they save.
+
+    Returns:
+        (header line, matching lines in file order, total line count)
+    """
+    # mmap can't map an empty file; there is nothing to scan anyway
+    if os.path.getsize(csv_path) == 0:
+        return b'', [], 0
+
+    lines: List[bytes] = []
+    total_rows = 0
+
+    # The file object is only needed for its descriptor, so skip its buffer
+    with open(csv_path, 'rb', buffering=0) as f, \
+         mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_line = mm.readline()
+        n_chunks = SCAN_CHUNKS if len(mm) >= CHUNKED_SCAN_MIN_BYTES else 1
+        ranges = _split_byte_ranges(mm, len(header_line), n_chunks)
+
+        for done, (start, end) in enumerate(ranges, 1):
+            chunk_lines, chunk_rows = _scan_byte_range(mm, start, end)
+            lines.extend(chunk_lines)
+            total_rows += chunk_rows
+
+            # Show progress once per scanned chunk
+            if len(ranges) > 1:
+                print(f"   ... scanned {done}/{len(ranges)} chunks "
+                      f"({total_rows:,} rows), found {len(lines)} candidate rows")
+
+    return header_line, lines, total_rows
+
+
+def _interned(column: pd.Series) -> pd.Series:
+    """
+    Intern a low-cardinality string column (designation, status, ...)
+
+    Repeated values then share a single str object in the component records
+    instead of one copy per row. Built as an explicit object Series, since
+    pandas would otherwise re-infer its string dtype and copy the values.
+    """
+    return pd.Series(
+        [sys.intern(value) for value in column],
+        index=column.index,
+        dtype=object,
+    )
+
+
+def _group_components(
+    df: pd.DataFrame
+) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Build WHS component records from WDPA rows, grouped by site name
+
+    Field conversion runs column-wise over the DataFrame; the per-component
+    dicts are only built at the end, and only for sites with 2+ components.
+
+    Returns:
+        (every site name, component records of multi-component sites)
+    """
+    names = df['NAME']
+    iso_codes = df['ISO3'].map(
+        lambda iso3: (
+            [sys.intern(code.strip()) for code in iso3.split(';')] if iso3 else []
+        )
+    )
+
+    # Every site name (first-seen order) feeds the UNESCO mapping
+    site_names = names.unique().tolist()
+
+    # Single-component sites are dropped downstream (serial/transboundary
+    # sites only), so don't build component records for them
+    multi = names.duplicated(keep=False)
+    df = df[multi]
+
+    # Empty REP_AREA means 0; everything else is a plain decimal, so a direct
+    # float cast suffices (and still fails loudly on malformed values)
+    area = df['REP_AREA']
+    area_km2 = area.where(area != '', '0').astype('float64')
+
+    components = pd.DataFrame({
+        "wdpa_id": df['WDPAID'],
+        "wdpa_pid": df['WDPA_PID'],
+        "name": df['NAME'],
+        "name_orig": df['ORIG_NAME'],
+        "designation": _interned(df['DESIG_ENG']),
+        "iucn_category": _interned(df['IUCN_CAT']),
+        "status": _interned(df['STATUS']),
+        "status_year": _interned(df['STATUS_YR']),
+        "area_km2": area_km2,
+        "iso_codes": iso_codes[multi],
+        "marine": df['MARINE'] != '0',
+    })
+
+    # Group by site name (keeps first-seen order of sites and components).
+    # Records are built in one to_dict call; per-group to_dict is much slower.
+    records = components.to_dict('records')
+    positions = components.groupby('name', sort=False).indices
+
+    whs_sites = {
+        name: [records[i] for i in positions[name]]
+        for name in components['name'].unique()
+    }
+
+    return site_names, whs_sites
+
+
+def _whs_frame(reader: Iterator[List[str]]) -> Tuple[pd.DataFrame, int]:
+    """
+    Select WDPA_COLUMNS of the WHS rows from CSV rows (header first)
+
+    Returns:
+        (all-string DataFrame of WHS rows, total record count)
+    """
+    header = next(reader, None)
+    if header is None:
+        return pd.DataFrame(columns=WDPA_COLUMNS, dtype=object), 0
+
+    # Resolve column positions once, then pick fields with a C-level getter
+    select = operator.itemgetter(*(header.index(name) for name in WDPA_COLUMNS))
+    i_desig = header.index('DESIG_ENG')
+    wh_marker = WH_MARKER
+
+    rows = []
+    total_rows = 0
+    for row in reader:
+        total_rows += 1
+        if wh_marker in row[i_desig]:
+            rows.append(select(row))
+
+    return pd.DataFrame(rows, columns=WDPA_COLUMNS, dtype=object), total_rows
+
+
+def _read_whs_frame_full(csv_path: Path) -> Tuple[pd.DataFrame, int]:
+    """
+    Parse the whole CSV and return its WHS rows (slow path)
+
+    Uses PyArrow's multithreaded CSV reader when installed, materializing only
+    WDPA_COLUMNS and filtering designations in Arrow; otherwise the csv
+    module, which beats pandas' read_csv on this many columns.
+
+    Returns:
+        (WHS rows, total record count)
+    """
+    if pacsv is not None:
+        table = pacsv.read_csv(
+            csv_path,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=WDPA_COLUMNS,
+                column_types={name: pa.string() for name in WDPA_COLUMNS},
+                strings_can_be_null=False,
+            ),
+        )
+        whs = table.filter(pc.match_substring(table['DESIG_ENG'], WH_MARKER))
+        return whs.to_pandas(), table.num_rows
+
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return _whs_frame(csv.reader(f))
+
+
+def _parse_whs_lines(
+    header_line: bytes,
+    lines: List[bytes]
+) -> Optional[pd.DataFrame]:
+    """
+    Parse scanned candidate lines into WHS rows (fast path)
+
+    A quoted line break splits its record across lines, and the fragment
+    holding the marker can still have balanced quotes (one break before
+    DESIG_ENG, another after it), so counting quotes isn't enough. Instead
+    the lines are parsed strictly and must yield one header-width record
+    each; otherwise None is returned and the caller parses the whole file.
+    """
+    text = (line.decode('utf-8') for line in (header_line, *lines))
+    try:
+        rows = list(csv.reader(text, strict=True))
+    except csv.Error:
+        return None
+
+    width = len(rows[0])
+    if len(rows) != len(lines) + 1 or any(len(row) != width for row in rows):
+        return None
+
+    return _whs_frame(iter(rows))[0]
+
+
+def extract_whs_components(
+    csv_path: Path
+) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]]]:
     """
     Extract World Heritage Site components from WDPA CSV
 
     Returns:
-        Dict mapping site names to list of components
-        {
-            "Great Wall": [
-                {
-                    "wdpa_id": "12345",
-                    "name": "Badaling Section",
+        Every WHS site name, and components of the sites that have more
+        than one (serial/transboundary properties)
+        (
+            ["Great Wall", ...],
+            {
+                "Great Wall": [
+                    {
+                        "wdpa_id": "12345",
+                        "name": "Badaling Section",
+                        ...
+                    },
                     ...
-                },
-                ...
-            ]
-        }
+                ]
+            }
+        )
     """
     print(f"📖 Reading WDPA CSV: {csv_path}")
     print(f"   (This may take a minute, processing 300K+ rows...)")
 
-    # Group components by site name
-    whs_sites = defaultdict(list)
-    whs_count = 0
-    total_rows = 0
-
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-
-            for row in reader:
-                total_rows += 1
-
-                # Show progress every 50k rows
-                if total_rows % 50000 == 0:
-                    print(f"   ... processed {total_rows:,} rows, found {whs_count} WHS components")
-
-                desig_eng = row.get('DESIG_ENG', '')
-
-                # Filter: Only World Heritage Sites
-                if 'World Heritage' not in desig_eng:
-                    continue
-
-                whs_count += 1
-
-                # Extract component info
-                component = {
-                    "wdpa_id": row.get('WDPAID', ''),
-                    "wdpa_pid": row.get('WDPA_PID', ''),
-                    "name": row.get('NAME', ''),
-                    "name_orig": row.get('ORIG_NAME', ''),
-                    "designation": desig_eng,
-                    "iucn_category": row.get('IUCN_CAT', ''),
-                    "status": row.get('STATUS', ''),
-                    "status_year": row.get('STATUS_YR', ''),
-                    "area_km2": float(row.get('REP_AREA', 0) or 0),
-                    "iso_codes": [code.strip() for code in row.get('ISO3', '').split(';')] if row.get('ISO3') else [],
-                    "marine": row.get('MARINE', '0') != '0',
-                }
-
-                # Group by site name
-                site_name = component['name']
-                whs_sites[site_name].append(component)
+        header_line, lines, total_rows = _scan_whs_lines(csv_path)
+
+        # The line scan counts physical lines; only a full parse counts
+        # CSV records (quoted line breaks make these differ)
+        total_unit = 'lines'
+
+        if not header_line:
+            # Empty file: nothing to parse, not even a header
+            df = pd.DataFrame(columns=WDPA_COLUMNS, dtype=object)
+        else:
+            df = _parse_whs_lines(header_line, lines)
+
+        # The line scan can't reassemble records split across lines
+        if df is None:
+            print("   ⚠️  Multi-line records found, falling back to full CSV parse...")
+            df, total_rows = _read_whs_frame_full(csv_path)
+            total_unit = 'rows'
+
+        site_names, whs_sites = _group_components(df)
 
     except FileNotFoundError:
         print(f"❌ File not found: {csv_path}")
@@ -97,11 +384,12 @@ def extract_whs_components(csv_path: Path) -> Dict[str, List[Dict[str, Any]]]:
         print(f"❌ Error reading CSV: {e}")
         raise
 
-    print(f"   ✓ Processed {total_rows:,} total rows")
-    print(f"   ✓ Found {whs_count} World Heritage Site components")
-    print(f"   ✓ Grouped into {len(whs_sites)} unique sites")
+    print(f"   ✓ Processed {total_rows:,} total {total_unit}")
+    print(f"   ✓ Found {len(df)} World Heritage Site components")
+    print(f"   ✓ Grouped into {len(site_names)} unique sites "
+          f"({len(whs_sites)} with multiple components)")
 
-    return dict(whs_sites)
+    return site_names, whs_sites
 
 
 def load_unesco_sites(sites_json_path: Path) -> List[Dict[str, Any]]:
@@ -111,65 +399,197 @@ def load_unesco_sites(sites_json_path: Path) -> List[Dict[str, Any]]:
         print(f"   Please run 'npm run prepare:data' first to generate sites.json")
         raise FileNotFoundError(f"sites.json not found at {sites_json_path}")
 
+    if orjson is not None:
+        with open(sites_json_path, 'rb') as f:
+            return orjson.loads(f.read())
+
     with open(sites_json_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def _encode_json(data: Any) -> bytes:
+    """
+    Encode data as pretty-printed UTF-8 JSON (2-space indent)
+
+    orjson and json spell some floats differently (1e-05 vs 0.00001), so
+    output is only guaranteed to parse to the same values, not the same bytes.
+    """
+    if orjson is not None:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=options)
+
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def save_json(data: Dict[str, Any], path: Path) -> None:
+    """
+    Write a dict as pretty-printed UTF-8 JSON (2-space indent)
+
+    Entries are encoded and written one at a time, so peak memory is bounded
+    by the largest value rather than the whole document.
+    """
+    with open(path, 'wb', buffering=1 << 20) as f:
+        if not data:
+            f.write(b'{}')
+            return
+
+        separator = b'{\n  '
+        for key, value in data.items():
+            f.write(separator)
+            f.write(_encode_json(key))
+            f.write(b': ')
+            # Nest the value one level deeper; encoded JSON strings never
+            # contain raw newlines, so this only touches structural ones
+            f.write(_encode_json(value).replace(b'\n', b'\n  '))
+            separator = b',\n  '
+
+        f.write(b'\n}')
+
+
+def _is_word_bounded(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] isn't flanked by letters or digits"""
+    return (start == 0 or not text[start - 1].isalnum()) and \
+           (end == len(text) or not text[end].isalnum())
+
+
+def _contains_words(text: str, part: str) -> bool:
+    """Check that part occurs in text as whole words ("anjar" isn't in "kilimanjaro")"""
+    start = text.find(part)
+
+    while start != -1:
+        if _is_word_bounded(text, start, start + len(part)):
+            return True
+        start = text.find(part, start + 1)
+
+    return False
+
+
 def create_unesco_mapping(
-    whs_data: Dict[str, List[Dict[str, Any]]],
+    site_names: List[str],
     unesco_sites: List[Dict[str, Any]]
 ) -> Dict[str, str]:
     """
     Create mapping between WDPA site names and UNESCO IDs
 
-    This uses fuzzy matching - may need manual adjustment for some sites
+    Tries an exact match, then a whole-word substring match, then fuzzy
+    matching (RapidFuzz token-set ratio) - may need manual adjustment for
+    some sites
+
+    Matching is by name only. WDPA ISO3 holds alpha-3 codes while sites.json
+    holds alpha-2, so the two can't be compared for country overlap.
     """
     print("\n🔗 Creating UNESCO ID mapping...")
 
+    # Precompute UNESCO choice lists once (parallel to unesco_sites)
+    unesco_names = [site['translations']['en']['name'] for site in unesco_sites]
+    unesco_lower_names = [name.lower() for name in unesco_names]
+    unesco_ids = [site['idNumber'] for site in unesco_sites]
+
+    # RapidFuzz-normalized names (lowercased, punctuation stripped). Passing
+    # processor= to RapidFuzz would redo this for every choice on every call.
+    unesco_processed = [utils.default_process(name) for name in unesco_names]
+
+    # Exact lookup (lowercase name -> sites) skips all other strategies on a hit
+    exact_to_unesco_idx: Dict[str, List[int]] = defaultdict(list)
+    for idx, unesco_lower in enumerate(unesco_lower_names):
+        exact_to_unesco_idx[unesco_lower].append(idx)
+
+    # Inverted index (name token -> sites) so substring tests only run
+    # against sites sharing at least one word with the WDPA name. A whole-word
+    # substring always shares a token, so no match is lost.
+    token_to_unesco_idx: Dict[str, List[int]] = defaultdict(list)
+    for idx, unesco_lower in enumerate(unesco_lower_names):
+        for token in set(WORD_TOKEN_RE.findall(unesco_lower)):
+            token_to_unesco_idx[token].append(idx)
+
+    # Aho-Corasick automaton over UNESCO names: finds every UNESCO name
+    # contained in a WDPA name in a single linear pass. Only names with a
+    # token are added, matching what the token index can offer.
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for idx, unesco_lower in enumerate(unesco_lower_names):
+            if WORD_TOKEN_RE.search(unesco_lower) and unesco_lower not in automaton:
+                automaton.add_word(unesco_lower, idx)
+        if len(automaton):
+            automaton.make_automaton()
+        else:
+            automaton = None
+
+    match_by_name: Dict[str, Optional[int]] = {}
+
+    # Names left for the fuzzy tier
+    fuzzy_pending: List[str] = []
+
+    for wdpa_name in site_names:
+        wdpa_lower = wdpa_name.lower()
+        wdpa_tokens = set(WORD_TOKEN_RE.findall(wdpa_lower))
+
+        # Strategy 1: Exact match (case-insensitive); for duplicate names,
+        # the first site wins
+        match_idx = None
+        exact_idx = exact_to_unesco_idx.get(wdpa_lower)
+        if exact_idx:
+            match_idx = exact_idx[0]
+
+        # Strategy 2: Whole-word substring match (either direction)
+        if match_idx is None:
+            token_idx = {
+                idx
+                for token in wdpa_tokens
+                for idx in token_to_unesco_idx.get(token, ())
+            }
+            substring_idx = {
+                idx for idx in token_idx
+                if _contains_words(unesco_lower_names[idx], wdpa_lower)
+                or (automaton is None
+                    and _contains_words(wdpa_lower, unesco_lower_names[idx]))
+            }
+            if automaton is not None:
+                for end, idx in automaton.iter(wdpa_lower):
+                    start = end - len(unesco_lower_names[idx]) + 1
+                    if _is_word_bounded(wdpa_lower, start, end + 1):
+                        substring_idx.add(idx)
+
+            match_idx = min(substring_idx, default=None)
+
+        match_by_name[wdpa_name] = match_idx
+        if match_idx is None:
+            fuzzy_pending.append(wdpa_name)
+
+    # Strategy 3: Fuzzy token-set match. All remaining names are scored in
+    # one cdist call, which runs in C++ threads (one per core) with the GIL
+    # released.
+    if fuzzy_pending:
+        scores = process.cdist(
+            [utils.default_process(wdpa_name) for wdpa_name in fuzzy_pending],
+            unesco_processed,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=FUZZY_SCORE_CUTOFF,
+            dtype=np.float64,
+            workers=-1,
+        )
+    else:
+        scores = []
+
+    fuzzy_matches: List[Optional[int]] = []
+    for row in scores:
+        # argmax returns the first best score, like extractOne
+        match_idx = int(row.argmax())
+        if row[match_idx] < FUZZY_SCORE_CUTOFF:
+            match_idx = None
+        fuzzy_matches.append(match_idx)
+
+    match_by_name.update(zip(fuzzy_pending, fuzzy_matches))
+
     mapping = {}
     unmatched = []
 
-    for wdpa_name, components in whs_data.items():
-        matched = False
-
-        for site in unesco_sites:
-            # Get UNESCO name (English)
-            unesco_name = site['translations']['en']['name']
-
-            # Strategy 1: Exact match (case-insensitive)
-            if wdpa_name.lower() == unesco_name.lower():
-                mapping[wdpa_name] = site['idNumber']
-                matched = True
-                break
-
-            # Strategy 2: Substring match
-            wdpa_lower = wdpa_name.lower()
-            unesco_lower = unesco_name.lower()
-
-            if wdpa_lower in unesco_lower or unesco_lower in wdpa_lower:
-                mapping[wdpa_name] = site['idNumber']
-                matched = True
-                break
-
-            # Strategy 3: Match by ISO codes + first word
-            if components and components[0]['iso_codes']:
-                wdpa_iso = set(code.lower() for code in components[0]['iso_codes'])
-                unesco_iso = set(code.lower() for code in site['isoCodes'])
-
-                # If ISO codes overlap and first word matches
-                if wdpa_iso & unesco_iso:
-                    wdpa_first = wdpa_name.split()[0].lower()
-                    unesco_first = unesco_name.split()[0].lower()
-
-                    if wdpa_first == unesco_first or \
-                       wdpa_first in unesco_lower or \
-                       unesco_first in wdpa_lower:
-                        mapping[wdpa_name] = site['idNumber']
-                        matched = True
-                        break
-
-        if not matched:
+    for wdpa_name, match_idx in match_by_name.items():
+        if match_idx is None:
             unmatched.append(wdpa_name)
+        else:
+            mapping[wdpa_name] = unesco_ids[match_idx]
 
     print(f"   ✓ Matched {len(mapping)} sites to UNESCO IDs")
     print(f"   ⚠️  Unmatched: {len(unmatched)} sites")
@@ -206,7 +626,7 @@ def main():
 
     try:
         # Step 1: Extract components from WDPA
-        whs_components = extract_whs_components(wdpa_csv)
+        site_names, whs_components = extract_whs_components(wdpa_csv)
 
         # Step 2: Load UNESCO sites
         print(f"\n📚 Loading UNESCO sites from: {unesco_json}")
@@ -214,33 +634,30 @@ def main():
         print(f"   ✓ Loaded {len(unesco_sites)} UNESCO sites")
 
         # Step 3: Create mapping
-        unesco_mapping = create_unesco_mapping(whs_components, unesco_sites)
+        unesco_mapping = create_unesco_mapping(site_names, unesco_sites)
 
         # Step 4: Reorganize by UNESCO ID
         print(f"\n🔄 Reorganizing components by UNESCO ID...")
         components_by_id = {}
 
+        # whs_components only holds sites with multiple components
+        # (serial/transboundary); single-component sites don't need this data
         for wdpa_name, components in whs_components.items():
             unesco_id = unesco_mapping.get(wdpa_name)
             if unesco_id:
-                # Only keep sites with multiple components (serial/transboundary)
-                # Single-component sites don't need this data
-                if len(components) > 1:
-                    components_by_id[unesco_id] = components
+                components_by_id[unesco_id] = components
 
         print(f"   ✓ Found {len(components_by_id)} sites with multiple components")
 
         # Step 5: Save outputs
         print(f"\n💾 Saving outputs...")
 
-        with open(components_json, 'w', encoding='utf-8') as f:
-            json.dump(components_by_id, f, indent=2, ensure_ascii=False)
+        save_json(components_by_id, components_json)
 
         file_size = components_json.stat().st_size / 1024
         print(f"   ✓ Components: {components_json} ({file_size:.1f} KB)")
 
-        with open(mapping_json, 'w', encoding='utf-8') as f:
-            json.dump(unesco_mapping, f, indent=2, ensure_ascii=False)
+        save_json(unesco_mapping, mapping_json)
 
         file_size = mapping_json.stat().st_size / 1024
         print(f"   ✓ Mapping: {mapping_json} ({file_size:.1f} KB)")
@@ -249,8 +666,8 @@ def main():
         print("\n" + "=" * 70)
         print("✅ WDPA extraction completed successfully!")
         print(f"\n📊 Summary:")
-        print(f"   - Total WHS components in WDPA: {sum(len(v) for v in whs_components.values())}")
-        print(f"   - Unique sites in WDPA: {len(whs_components)}")
+        print(f"   - Unique sites in WDPA: {len(site_names)}")
+        print(f"   - Multi-component sites in WDPA: {len(whs_components)}")
         print(f"   - Matched to UNESCO IDs: {len(unesco_mapping)}")
         print(f"   - Sites with multiple components: {len(components_by_id)}")
 